@@ -0,0 +1,6 @@
+"""Allow running Engram as `python -m engram`."""
+
+from .cli import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Long-lived capture daemon that hook invocations talk to over a Unix socket."""
+
+import json
+import os
+import socket
+import socketserver
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+DEFAULT_SOCKET_PATH = Path.home() / ".engram" / "engram.sock"
+
+# Hooks must never wait on a wedged daemon; past this they fall back to the spool
+CONNECT_TIMEOUT = 0.5
+
+
+def get_socket_path() -> Path:
+    """Get socket path, creating directory if needed."""
+    socket_path = DEFAULT_SOCKET_PATH
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    return socket_path
+
+
+def send(payload: dict[str, Any], path: Path | None = None) -> bool:
+    """
+    Send one request to a running daemon.
+
+    Returns:
+        False if no daemon is listening (caller should fall back)
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+
+    path = path or DEFAULT_SOCKET_PATH
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.sendall(json.dumps(payload, ensure_ascii=False).encode() + b"\n")
+        return True
+    except OSError:
+        return False
+
+
+def handle(request: dict[str, Any]) -> None:
+    """
+    Apply one request using the process-wide DB connection and vector store.
+
+    A save that fails is spooled instead of dropped, so the next flush
+    retries it.
+    """
+    from ..core import get_db, get_vector_store
+    from ..core.db import save_observation
+    from . import spool
+
+    if request.get("op") != "save":
+        return
+
+    content = request["content"]
+    session = request.get("session", "hook")
+    obs_type = request.get("type", "discovery")
+    project_path = request.get("project")
+    metadata = request.get("metadata")
+    if not metadata:
+        # Chroma rejects empty metadata and None values
+        metadata = {"type": obs_type, "session_id": session}
+        if project_path is not None:
+            metadata["project_path"] = project_path
+
+    obs_id = None
+    try:
+        obs_id = save_observation(get_db(), session, obs_type, content, project_path=project_path)
+        vector = get_vector_store()
+        if vector.is_ready():
+            vector.add(obs_id, content, metadata)
+    except Exception:
+        # If the row reached SQLite, the spooled copy carries its id so a
+        # flush only retries the vector
+        spool.append(
+            session,
+            obs_type,
+            content,
+            project_path=project_path,
+            metadata=metadata,
+            observation_id=obs_id,
+        )
+        raise
+
+    # Saves work again, so retry anything spooled by earlier failures. This
+    # event is already stored, so a failed flush must not surface as its error.
+    try:
+        if spool.should_flush():
+            spool.flush()
+    except Exception:
+        pass  # The records stay spooled for the next flush
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                handle(json.loads(line))
+            except Exception:
+                continue  # One bad event must not take the daemon down
+
+
+def serve(path: Path | None = None, on_ready: Callable[[], None] | None = None) -> None:
+    """
+    Listen for capture requests until interrupted.
+
+    Args:
+        path: Socket path (default ~/.engram/engram.sock)
+        on_ready: Called once the socket is bound
+    """
+    from . import spool
+
+    path = path or get_socket_path()
+    if path.exists():
+        if send({"op": "ping"}, path):
+            raise RuntimeError(f"Daemon already running on {path}")
+        path.unlink()  # Stale socket left by a crashed daemon
+
+    # Pick up anything hooks spooled while the daemon was down. A failure
+    # here leaves the records spooled and must not keep the daemon from starting.
+    try:
+        spool.flush()
+    except Exception:
+        pass
+
+    # The base server handles one connection at a time, which the shared
+    # SQLite connection requires
+    with socketserver.UnixStreamServer(str(path), _Handler) as server:
+        os.chmod(path, 0o600)
+        if on_ready is not None:
+            on_ready()
+        try:
+            server.serve_forever()
+        finally:
+            path.unlink(missing_ok=True)
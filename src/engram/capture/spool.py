@@ -0,0 +1,230 @@
+"""Spool file that buffers hook captures until they are flushed in bulk."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+DEFAULT_SPOOL_PATH = Path.home() / ".engram" / "pending.jsonl"
+
+# Flush once this many observations are pending, or the oldest is this old (seconds)
+FLUSH_MAX_PENDING = 100
+FLUSH_MAX_AGE = 5.0
+
+# A background flush that hasn't released its lock after this long is presumed dead
+FLUSH_LOCK_TIMEOUT = 60.0
+
+# A record that fails this many flushes is moved to pending.failed.jsonl
+FLUSH_MAX_ATTEMPTS = 5
+
+
+def get_spool_path() -> Path:
+    """Get spool path, creating directory if needed."""
+    spool_path = DEFAULT_SPOOL_PATH
+    spool_path.parent.mkdir(parents=True, exist_ok=True)
+    return spool_path
+
+
+def append(
+    session_id: str,
+    obs_type: str,
+    content: str,
+    project_path: str | None = None,
+    metadata: dict[str, Any] | None = None,
+    path: Path | None = None,
+    observation_id: int | None = None,
+) -> None:
+    """
+    Append an observation to the spool without touching SQLite or ChromaDB.
+
+    Pass observation_id when the row is already in SQLite and only its
+    vector still needs writing.
+    """
+    path = path or get_spool_path()
+    record = {
+        "session_id": session_id,
+        "type": obs_type,
+        "content": content,
+        "project_path": project_path,
+        "metadata": metadata or {},
+        "ts": time.time(),
+    }
+    if observation_id is not None:
+        record["id"] = observation_id
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _read(path: Path) -> list[dict[str, Any]]:
+    records = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Skip lines torn by a crashed writer
+    return records
+
+
+def should_flush(path: Path | None = None) -> bool:
+    """
+    Check whether the spool has reached its size or age threshold.
+
+    Records requeued by a failed flush don't count, so they only ride along
+    with the next flush instead of forcing one on every capture.
+    """
+    path = path or get_spool_path()
+    try:
+        records = _read(path)
+    except FileNotFoundError:
+        return False
+    fresh = [r for r in records if not r.get("attempts")]
+    if not fresh:
+        return False
+    if len(fresh) >= FLUSH_MAX_PENDING:
+        return True
+    return time.time() - fresh[0].get("ts", 0) >= FLUSH_MAX_AGE
+
+
+def flush(path: Path | None = None, release_lock: bool = False) -> int:
+    """
+    Drain pending observations into SQLite and the vector store.
+
+    The spool is renamed before reading so captures arriving during a flush
+    start a fresh spool instead of being lost. If the batch fails, records
+    are retried one by one; those that still fail go back to the spool, and
+    after FLUSH_MAX_ATTEMPTS flushes to pending.failed.jsonl.
+
+    Args:
+        path: Spool file (default ~/.engram/pending.jsonl)
+        release_lock: Remove the background-flush lock when done. Only the
+            process started by flush_in_background() owns that lock.
+
+    Returns:
+        Number of observations flushed
+    """
+    path = path or get_spool_path()
+    try:
+        return _flush(path)
+    finally:
+        if release_lock:
+            _lock_path(path).unlink(missing_ok=True)
+
+
+def _flush(path: Path) -> int:
+    batch_path = path.with_name(f"{path.stem}.{os.getpid()}.flushing")
+    try:
+        os.replace(path, batch_path)
+    except FileNotFoundError:
+        return 0
+
+    records = _read(batch_path)
+    try:
+        _write(records)
+        flushed = len(records)
+    except Exception:
+        # Retry one at a time so a single bad record can't hold back the rest
+        flushed = 0
+        failed = []
+        for r in records:
+            try:
+                _write([r])
+                flushed += 1
+            except Exception:
+                failed.append(r)
+        _requeue(path, failed)
+
+    batch_path.unlink()
+    return flushed
+
+
+def _write(records: list[dict[str, Any]]) -> None:
+    from ..core import get_db, get_vector_store
+    from ..core.db import save_observations
+
+    if not records:
+        return
+
+    # Records that carry an id were saved to SQLite by an earlier flush whose
+    # vector write failed; only their vectors are still missing
+    unsaved = [r for r in records if r.get("id") is None]
+    obs_ids = save_observations(get_db(), [
+        (r["session_id"], r["type"], r["content"], None, None, r.get("project_path"))
+        for r in unsaved
+    ])
+    for r, obs_id in zip(unsaved, obs_ids):
+        r["id"] = obs_id
+
+    vector = get_vector_store()
+    if vector.is_ready():
+        contents = [r["content"] for r in records]
+        vector.add_many(
+            [r["id"] for r in records],
+            contents,
+            [r.get("metadata") or {} for r in records],
+            embeddings=vector.embed_batch(contents),
+        )
+
+
+def _requeue(path: Path, records: list[dict[str, Any]]) -> None:
+    """Put failed records back, keeping ids so SQLite rows aren't inserted twice."""
+    retry: list[str] = []
+    give_up: list[str] = []
+    for r in records:
+        r["attempts"] = r.get("attempts", 0) + 1
+        line = json.dumps(r, ensure_ascii=False) + "\n"
+        (give_up if r["attempts"] >= FLUSH_MAX_ATTEMPTS else retry).append(line)
+    for target, lines in ((path, retry), (_failed_path(path), give_up)):
+        if lines:
+            with target.open("a", encoding="utf-8") as f:
+                f.write("".join(lines))
+
+
+def _failed_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.failed.jsonl")
+
+
+def _lock_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.lock")
+
+
+def flush_in_background(path: Path | None = None) -> bool:
+    """
+    Start `engram flush` in a detached process and return immediately.
+
+    At most one background flush runs at a time; the lock is released when
+    the flush it started finishes.
+
+    Returns:
+        True if a flush process was started
+    """
+    path = path or get_spool_path()
+    lock = _lock_path(path)
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        try:
+            if time.time() - lock.stat().st_mtime < FLUSH_LOCK_TIMEOUT:
+                return False
+        except FileNotFoundError:
+            pass
+        lock.touch()  # Take over a stale lock
+
+    if os.name == "posix":
+        detach = {"start_new_session": True}
+    else:
+        detach = {
+            "creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+        }
+
+    subprocess.Popen(
+        [sys.executable, "-m", "engram", "flush", "--release-lock"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **detach,
+    )
+    return True
@@ -0,0 +1,25 @@
+"""CLI subcommands, one module per command, imported only when invoked."""
+
+import functools
+from typing import TYPE_CHECKING
+
+import click
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+@functools.cache
+def get_console() -> "Console":
+    """Shared Rich console, created on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+def warn(message: str, output_format: str = "table") -> None:
+    """Print a warning without polluting machine-readable output on stdout."""
+    if output_format == "table":
+        get_console().print(f"[yellow]{message}[/yellow]")
+    else:
+        click.echo(message, err=True)
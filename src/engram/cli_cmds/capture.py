@@ -0,0 +1,91 @@
+"""`engram capture` command."""
+
+import json
+import sys
+
+import click
+
+from ..core.project import get_project_name, get_project_path
+
+
+@click.command(name="capture")
+@click.option("--hook", type=click.Choice(["post-tool-use", "stop"]), required=True,
+              help="Hook type that triggered this capture")
+def cmd(hook: str):
+    """Capture observations from Claude Code hooks (internal use)."""
+    # Read JSON from stdin (Claude Code sends session data)
+    try:
+        if not sys.stdin.isatty():
+            input_data = sys.stdin.read()
+            if input_data.strip():
+                data = json.loads(input_data)
+            else:
+                data = {}
+        else:
+            data = {}
+    except json.JSONDecodeError:
+        data = {}
+
+    # Get project info
+    project_path = get_project_path()
+    project_name = get_project_name(project_path)
+
+    # Determine observation type and content based on hook
+    if hook == "post-tool-use":
+        # Extract tool usage info
+        tool_name = data.get("tool_name", "unknown")
+        tool_input = data.get("tool_input", {})
+
+        # Skip trivial tools
+        if tool_name in ("Read", "Glob", "Grep", "LS"):
+            return  # Don't save read-only operations
+
+        # Build observation content
+        content = f"[{tool_name}] "
+        if tool_name == "Bash":
+            content += tool_input.get("command", "")[:200]
+        elif tool_name in ("Edit", "Write"):
+            file_path = tool_input.get("file_path", "")
+            content += f"Modified {file_path}"
+        else:
+            content += json.dumps(tool_input)[:200]
+
+        obs_type = "change"
+
+    elif hook == "stop":
+        # Session end - could summarize the session
+        # For now, just note the session ended
+        content = f"Session ended in {project_name}"
+        obs_type = "discovery"
+
+    else:
+        return
+
+    metadata = {
+        "type": obs_type,
+        "hook": hook,
+        "project_path": project_path,
+        "project_name": project_name,
+    }
+
+    # Hand off to the daemon if it's running; otherwise spool the observation
+    # and return, leaving a detached process to write in bulk
+    try:
+        from ..capture import daemon, spool
+
+        if daemon.send({
+            "op": "save",
+            "session": "hook",
+            "type": obs_type,
+            "content": content,
+            "project": project_path,
+            "metadata": metadata,
+        }):
+            return
+
+        spool.append("hook", obs_type, content, project_path=project_path, metadata=metadata)
+
+        if hook == "stop" or spool.should_flush():
+            spool.flush_in_background()
+    except Exception:
+        pass  # Fail silently - don't interrupt Claude Code
@@ -0,0 +1,28 @@
+"""`engram daemon` command."""
+
+import sys
+
+import click
+
+from . import get_console
+
+
+@click.command(name="daemon")
+def cmd():
+    """Keep Engram loaded and receive hook captures over a Unix socket."""
+    from ..capture.daemon import get_socket_path, serve
+
+    console = get_console()
+    socket_path = get_socket_path()
+    try:
+        serve(
+            socket_path,
+            on_ready=lambda: console.print(
+                f"[green]Listening on {socket_path}[/green] [dim](Ctrl+C to stop)[/dim]"
+            ),
+        )
+    except RuntimeError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,15 @@
+"""`engram flush` command."""
+
+import click
+
+from . import get_console
+
+
+@click.command(name="flush")
+@click.option("--release-lock", is_flag=True, hidden=True, help="Set by background flushes")
+def cmd(release_lock: bool):
+    """Write pending hook captures to the database."""
+    from ..capture import spool
+
+    count = spool.flush(release_lock=release_lock)
+    get_console().print(f"[green]Flushed {count} pending observations[/green]")
@@ -0,0 +1,101 @@
+"""`engram init` command."""
+
+import click
+
+from . import get_console
+
+
+@click.command(name="init")
+@click.option("--hooks/--no-hooks", default=True, help="Install Claude Code hooks")
+@click.option("--daemon/--no-daemon", default=False,
+              help="Install a user service for the capture daemon")
+def cmd(hooks: bool, daemon: bool):
+    """Initialize Engram - check dependencies and install hooks."""
+    from ..core import get_db, get_vector_store
+    from ..core.embedder import OllamaEmbedder
+    from ..setup import (
+        check_global_install,
+        check_model,
+        check_ollama,
+        install_daemon_service,
+        install_hooks,
+    )
+
+    console = get_console()
+    console.print("[bold]Engram Setup[/bold]\n")
+
+    all_ok = True
+
+    # Step 1: Check Ollama
+    console.print("[bold]1. Checking Ollama...[/bold]")
+    ok, msg = check_ollama()
+    if ok:
+        console.print(f"   [green]OK[/green] {msg}")
+    else:
+        console.print(f"   [red]FAIL[/red] {msg}")
+        all_ok = False
+
+    # Step 2: Check embedding model
+    console.print("[bold]2. Checking embedding model...[/bold]")
+    ok, msg = check_model("bge-m3")
+    if ok:
+        console.print(f"   [green]OK[/green] {msg}")
+    else:
+        console.print(f"   [yellow]MISSING[/yellow] {msg}")
+        console.print("   [dim]Attempting to pull model...[/dim]")
+        embedder = OllamaEmbedder()
+        if embedder.pull_model():
+            console.print("   [green]OK[/green] Model pulled successfully")
+        else:
+            console.print("   [red]FAIL[/red] Could not pull model")
+            all_ok = False
+
+    # Step 3: Check global install
+    console.print("[bold]3. Checking global installation...[/bold]")
+    ok, msg = check_global_install()
+    if ok:
+        console.print(f"   [green]OK[/green] {msg}")
+    else:
+        console.print(f"   [yellow]MISSING[/yellow] {msg}")
+        console.print("   [dim]Run: uv tool install -e .[/dim]")
+
+    # Step 4: Initialize DB
+    console.print("[bold]4. Initializing database...[/bold]")
+    get_db()
+    if get_vector_store().sync_quantized():
+        console.print("   [dim]Rebuilt int8 search index[/dim]")
+    console.print("   [green]OK[/green] SQLite + ChromaDB ready")
+
+    # Step 5: Install hooks (optional)
+    if hooks:
+        console.print("[bold]5. Installing Claude Code hooks...[/bold]")
+        ok, msg, changes = install_hooks()
+        if ok:
+            for hook_type, status in changes.items():
+                if status == "added":
+                    console.print(f"   [green]+[/green] {hook_type} hook added")
+                else:
+                    console.print(f"   [dim]=[/dim] {hook_type} already installed")
+        else:
+            console.print(f"   [red]FAIL[/red] {msg}")
+    else:
+        console.print("[bold]5. Skipping hooks[/bold] (--no-hooks)")
+
+    # Step 6: Install daemon service (optional)
+    if daemon:
+        console.print("[bold]6. Installing capture daemon service...[/bold]")
+        ok, msg = install_daemon_service()
+        if ok:
+            console.print(f"   [green]OK[/green] {msg}")
+        else:
+            console.print(f"   [yellow]SKIPPED[/yellow] {msg}")
+    else:
+        console.print("[bold]6. Skipping daemon service[/bold] (use --daemon to install)")
+
+    # Summary
+    console.print()
+    if all_ok:
+        console.print("[bold green]Engram is ready![/bold green]")
+        console.print("[dim]Try: engram save \"test observation\"[/dim]")
+    else:
+        console.print("[bold yellow]Setup incomplete. Fix issues above.[/bold yellow]")
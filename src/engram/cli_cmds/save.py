@@ -0,0 +1,42 @@
+"""`engram save` command."""
+
+import click
+
+from ..core.project import get_project_name, get_project_path
+from . import get_console
+
+
+@click.command(name="save")
+@click.argument("content")
+@click.option("--type", "-t", "obs_type", default="discovery",
+              type=click.Choice(["decision", "bugfix", "feature", "refactor", "discovery"]),
+              help="Type of observation")
+@click.option("--session", "-s", default="manual", help="Session ID")
+def cmd(content: str, obs_type: str, session: str):
+    """Save an observation to memory."""
+    from ..core import get_db, get_vector_store
+    from ..core.db import save_observation
+
+    console = get_console()
+    db = get_db()
+    vector = get_vector_store()
+
+    # Auto-detect project
+    project_path = get_project_path()
+    project_name = get_project_name(project_path)
+
+    # Check if embedder is ready
+    if not vector.is_ready():
+        console.print("[yellow]Warning: Ollama not available. Run 'ollama pull bge-m3' first.[/yellow]")
+        console.print("[dim]Saving to SQLite only (no semantic search)...[/dim]")
+        obs_id = save_observation(db, session, obs_type, content, project_path=project_path)
+    else:
+        obs_id = save_observation(db, session, obs_type, content, project_path=project_path)
+        vector.add(obs_id, content, {
+            "type": obs_type,
+            "session_id": session,
+            "project_path": project_path,
+            "project_name": project_name,
+        })
+
+    console.print(f"[green]Saved observation #{obs_id}[/green] [dim]({project_name})[/dim]")
@@ -0,0 +1,106 @@
+"""`engram search` command."""
+
+import json
+import sys
+
+import click
+
+from ..core.project import get_project_name, get_project_path
+from . import get_console, warn
+
+
+@click.command(name="search")
+@click.argument("query")
+@click.option("--limit", "-n", default=10, help="Maximum results")
+@click.option("--mode", "-m", default="hybrid",
+              type=click.Choice(["semantic", "keyword", "hybrid"]),
+              help="Search mode")
+@click.option("--project", "-p", is_flag=True, help="Filter by current project only")
+@click.option("--fusion", default="rrf", type=click.Choice(["rrf", "convex"]),
+              help="How hybrid mode merges semantic and keyword results")
+@click.option("--alpha", default=0.5, type=click.FloatRange(0.0, 1.0),
+              help="Semantic weight for convex fusion")
+@click.option("--format", "-f", "output_format", default=None,
+              type=click.Choice(["table", "json", "tsv"]),
+              help="Output format (default: table on a terminal, tsv when piped)")
+def cmd(
+    query: str,
+    limit: int,
+    mode: str,
+    project: bool,
+    fusion: str,
+    alpha: float,
+    output_format: str | None,
+):
+    """Search observations semantically."""
+    from ..search.semantic import SemanticSearch
+
+    if output_format is None:
+        output_format = "table" if sys.stdout.isatty() else "tsv"
+
+    searcher = SemanticSearch()
+
+    # Get project filter if requested
+    project_filter = get_project_path() if project else None
+
+    if not searcher.is_ready():
+        warn("Warning: Ollama not available. Using keyword search only.", output_format)
+        mode = "keyword"
+
+    results = searcher.search(
+        query, limit=limit, mode=mode, project_path=project_filter, fusion=fusion, alpha=alpha
+    )
+
+    # Machine-readable formats skip Rich entirely
+    if output_format == "json":
+        click.echo(json.dumps(results, ensure_ascii=False, default=str))
+        return
+    if output_format == "tsv":
+        lines = []
+        for r in results:
+            content = r.get("content") or r.get("compressed") or ""
+            lines.append("\t".join((
+                str(r.get("id")),
+                r.get("type", r.get("metadata", {}).get("type", "?")),
+                f"{r.get('score', 0):.3f}",
+                content.replace("\t", " ").replace("\n", " "),
+            )))
+        if lines:
+            click.echo("\n".join(lines))
+        return
+
+    from rich.table import Table
+
+    console = get_console()
+
+    if not results:
+        console.print("[dim]No results found.[/dim]")
+        return
+
+    title = f"Search Results ({mode} mode)"
+    if project_filter:
+        title += f" [dim]({get_project_name(project_filter)} only)[/dim]"
+
+    table = Table(title=title)
+    table.add_column("#", style="dim")
+    table.add_column("Type", style="cyan")
+    table.add_column("Content", max_width=50)
+    table.add_column("Project", style="magenta", max_width=15)
+    table.add_column("Score", style="green")
+
+    for i, r in enumerate(results, 1):
+        content = r.get("content", r.get("compressed", ""))[:80]
+        if len(content) == 80:
+            content += "..."
+        proj = r.get("metadata", {}).get("project_name", r.get("project_path", "?"))
+        if isinstance(proj, str) and "/" in proj:
+            proj = proj.split("/")[-1]  # Just show folder name
+        table.add_row(
+            str(i),
+            r.get("type", r.get("metadata", {}).get("type", "?")),
+            content,
+            proj[:15] if proj else "?",
+            f"{r.get('score', 0):.3f}",
+        )
+
+    console.print(table)
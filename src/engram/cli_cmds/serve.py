@@ -0,0 +1,34 @@
+"""`engram serve` command."""
+
+import sys
+
+import click
+
+from . import get_console
+
+
+@click.command(name="serve")
+@click.option("--host", default="localhost", help="Interface to bind")
+@click.option("--port", default=8000, help="Port to listen on")
+def cmd(host: str, port: int):
+    """Run a ChromaDB server so commands skip loading the vector index."""
+    import shutil
+    import subprocess
+
+    from ..core.vector import CHROMA_URL_ENV, DEFAULT_CHROMA_PATH
+
+    console = get_console()
+    chroma = shutil.which("chroma")
+    if not chroma:
+        console.print("[red]The 'chroma' command was not found. Is chromadb installed?[/red]")
+        sys.exit(1)
+
+    DEFAULT_CHROMA_PATH.mkdir(parents=True, exist_ok=True)
+    console.print(f"[dim]Set {CHROMA_URL_ENV}=http://{host}:{port} to use this server[/dim]")
+    result = subprocess.run([
+        chroma, "run",
+        "--path", str(DEFAULT_CHROMA_PATH),
+        "--host", host,
+        "--port", str(port),
+    ])
+    sys.exit(result.returncode)
@@ -0,0 +1,41 @@
+"""`engram status` command."""
+
+import click
+
+from . import get_console
+
+
+@click.command(name="status")
+def cmd():
+    """Check Engram system status."""
+    from rich.table import Table
+
+    from ..core import get_db, get_vector_store
+    from ..core.embedder import OllamaEmbedder
+
+    console = get_console()
+    db = get_db()
+    vector = get_vector_store()
+    embedder = OllamaEmbedder()
+
+    table = Table(title="Engram Status")
+    table.add_column("Component", style="cyan")
+    table.add_column("Status")
+    table.add_column("Details", style="dim")
+
+    # SQLite
+    cursor = db.execute("SELECT COUNT(*) FROM observations")
+    obs_count = cursor.fetchone()[0]
+    table.add_row("SQLite", "[green]OK[/green]", f"{obs_count} observations")
+
+    # ChromaDB
+    chroma_count = vector.count()
+    table.add_row("ChromaDB", "[green]OK[/green]", f"{chroma_count} vectors")
+
+    # Ollama
+    if embedder.is_available():
+        table.add_row("Ollama (bge-m3)", "[green]OK[/green]", "Model ready")
+    else:
+        table.add_row("Ollama (bge-m3)", "[red]NOT READY[/red]", "Run: ollama pull bge-m3")
+
+    console.print(table)
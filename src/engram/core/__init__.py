@@ -1 +1,36 @@
 """Core modules for database and vector storage."""
+
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from .vector import VectorStore
+
+__all__ = ["VectorStore", "get_db", "get_vector_store"]
+
+
+def __getattr__(name: str):
+    # Resolve VectorStore lazily so importing engram.core doesn't pull in chromadb
+    if name == "VectorStore":
+        from .vector import VectorStore
+
+        return VectorStore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=1)
+def get_db() -> "sqlite3.Connection":
+    """Shared database connection for this process."""
+    from .db import init_db
+
+    return init_db()
+
+
+@functools.lru_cache(maxsize=1)
+def get_vector_store() -> "VectorStore":
+    """Shared vector store for this process, so the index is opened once."""
+    from .vector import VectorStore
+
+    return VectorStore()
@@ -1,12 +1,85 @@
 """SQLite database for metadata and full-text search."""
 
+import json
 import sqlite3
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 DEFAULT_DB_PATH = Path.home() / ".engram" / "engram.db"
 
+# Bump when _SCHEMA changes so existing databases pick up the new DDL
+SCHEMA_VERSION = 3
+
+# WAL + synchronous=NORMAL avoids an fsync per commit; the rest keep hot pages in memory
+_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-64000;
+"""
+
+_SCHEMA = """
+    -- Sessions table
+    CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY,
+        started_at TEXT NOT NULL,
+        ended_at TEXT,
+        project_path TEXT,
+        summary TEXT
+    );
+
+    -- Observations table
+    CREATE TABLE IF NOT EXISTS observations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        type TEXT NOT NULL,  -- decision, bugfix, feature, refactor, discovery
+        content TEXT NOT NULL,
+        compressed TEXT,     -- AI-compressed version
+        file_refs TEXT,      -- JSON array of file paths
+        project_path TEXT,   -- Project root path
+        created_at TEXT NOT NULL,
+        token_count INTEGER,
+        FOREIGN KEY (session_id) REFERENCES sessions(id)
+    );
+
+    -- Indexes for project filtering, recency ordering and session lookups
+    CREATE INDEX IF NOT EXISTS idx_observations_project ON observations(project_path);
+    CREATE INDEX IF NOT EXISTS idx_observations_created ON observations(created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_observations_session ON observations(session_id);
+
+    -- Full-text search index
+    CREATE VIRTUAL TABLE IF NOT EXISTS observations_fts USING fts5(
+        content,
+        compressed,
+        content='observations',
+        content_rowid='id',
+        prefix='2 3 4'
+    );
+
+    -- Triggers to keep FTS in sync
+    CREATE TRIGGER IF NOT EXISTS observations_ai AFTER INSERT ON observations BEGIN
+        INSERT INTO observations_fts(rowid, content, compressed)
+        VALUES (new.id, new.content, new.compressed);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS observations_ad AFTER DELETE ON observations BEGIN
+        INSERT INTO observations_fts(observations_fts, rowid, content, compressed)
+        VALUES ('delete', old.id, old.content, old.compressed);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS observations_au AFTER UPDATE ON observations BEGIN
+        INSERT INTO observations_fts(observations_fts, rowid, content, compressed)
+        VALUES ('delete', old.id, old.content, old.compressed);
+        INSERT INTO observations_fts(rowid, content, compressed)
+        VALUES (new.id, new.content, new.compressed);
+    END;
+"""
+
+_CONNECTIONS: dict[Path, sqlite3.Connection] = {}
+
 
 def get_db_path() -> Path:
     """Get database path, creating directory if needed."""
@@ -16,69 +89,84 @@ def get_db_path() -> Path:
 
 
 def init_db(db_path: Path | None = None) -> sqlite3.Connection:
-    """Initialize database with schema."""
+    """
+    Initialize database with schema.
+
+    Connections are cached per path, so repeated calls within one process
+    share a connection and only the first one checks the schema.
+    """
     db_path = db_path or get_db_path()
+    conn = _CONNECTIONS.get(db_path)
+    if conn is not None:
+        return conn
+
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    conn.executescript(_PRAGMAS)
 
-    conn.executescript("""
-        -- Sessions table
-        CREATE TABLE IF NOT EXISTS sessions (
-            id TEXT PRIMARY KEY,
-            started_at TEXT NOT NULL,
-            ended_at TEXT,
-            project_path TEXT,
-            summary TEXT
-        );
-
-        -- Observations table
-        CREATE TABLE IF NOT EXISTS observations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT NOT NULL,
-            type TEXT NOT NULL,  -- decision, bugfix, feature, refactor, discovery
-            content TEXT NOT NULL,
-            compressed TEXT,     -- AI-compressed version
-            file_refs TEXT,      -- JSON array of file paths
-            project_path TEXT,   -- Project root path
-            created_at TEXT NOT NULL,
-            token_count INTEGER,
-            FOREIGN KEY (session_id) REFERENCES sessions(id)
-        );
-
-        -- Index for project filtering
-        CREATE INDEX IF NOT EXISTS idx_observations_project ON observations(project_path);
-
-        -- Full-text search index
-        CREATE VIRTUAL TABLE IF NOT EXISTS observations_fts USING fts5(
-            content,
-            compressed,
-            content='observations',
-            content_rowid='id'
-        );
-
-        -- Triggers to keep FTS in sync
-        CREATE TRIGGER IF NOT EXISTS observations_ai AFTER INSERT ON observations BEGIN
-            INSERT INTO observations_fts(rowid, content, compressed)
-            VALUES (new.id, new.content, new.compressed);
-        END;
-
-        CREATE TRIGGER IF NOT EXISTS observations_ad AFTER DELETE ON observations BEGIN
-            INSERT INTO observations_fts(observations_fts, rowid, content, compressed)
-            VALUES ('delete', old.id, old.content, old.compressed);
-        END;
-
-        CREATE TRIGGER IF NOT EXISTS observations_au AFTER UPDATE ON observations BEGIN
-            INSERT INTO observations_fts(observations_fts, rowid, content, compressed)
-            VALUES ('delete', old.id, old.content, old.compressed);
-            INSERT INTO observations_fts(rowid, content, compressed)
-            VALUES (new.id, new.content, new.compressed);
-        END;
-    """)
+    # Only run DDL when the file predates the current schema
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < SCHEMA_VERSION:
+        rebuild_fts = _migrate(conn, version)
+        conn.executescript(_SCHEMA)
+        if rebuild_fts:
+            # Repopulate the recreated index from the observations table
+            conn.execute("INSERT INTO observations_fts(observations_fts) VALUES ('rebuild')")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
 
-    conn.commit()
+    _CONNECTIONS[db_path] = conn
     return conn
 
 
+_INSERT_OBSERVATION = """
+    INSERT INTO observations (session_id, type, content, compressed, file_refs, project_path, created_at, token_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _observation_row(
+    session_id: str,
+    obs_type: str,
+    content: str,
+    file_refs: list[str] | None = None,
+    compressed: str | None = None,
+    project_path: str | None = None,
+) -> tuple:
+    return (
+        session_id,
+        obs_type,
+        content,
+        compressed,
+        json.dumps(file_refs) if file_refs else None,
+        project_path,
+        datetime.now().isoformat(),
+        len(content.split()),  # rough token estimate
+    )
+
+
+def _migrate(conn: sqlite3.Connection, version: int) -> bool:
+    """
+    Bring tables created by older versions up to the current schema.
+
+    Returns:
+        True if the FTS index was dropped and must be rebuilt after _SCHEMA runs
+    """
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(observations)")}
+    # Empty when the table doesn't exist yet; _SCHEMA creates it
+    if columns and "project_path" not in columns:
+        conn.execute("ALTER TABLE observations ADD COLUMN project_path TEXT")
+
+    # FTS5 options can't be altered, so recreate the index to add prefix indexes
+    fts_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'observations_fts'"
+    ).fetchone()
+    if fts_exists and version < 3:
+        conn.execute("DROP TABLE observations_fts")
+        return True
+    return False
+
+
 def save_observation(
     conn: sqlite3.Connection,
     session_id: str,
@@ -89,39 +177,57 @@ def save_observation(
     project_path: str | None = None,
 ) -> int:
     """Save an observation to the database."""
-    import json
-
     cursor = conn.execute(
-        """
-        INSERT INTO observations (session_id, type, content, compressed, file_refs, project_path, created_at, token_count)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            session_id,
-            obs_type,
-            content,
-            compressed,
-            json.dumps(file_refs) if file_refs else None,
-            project_path,
-            datetime.now().isoformat(),
-            len(content.split()),  # rough token estimate
-        ),
+        _INSERT_OBSERVATION,
+        _observation_row(session_id, obs_type, content, file_refs, compressed, project_path),
     )
     conn.commit()
     return cursor.lastrowid
 
 
+def save_observations(conn: sqlite3.Connection, rows: list[tuple]) -> list[int]:
+    """
+    Save many observations in a single transaction.
+
+    Args:
+        conn: Database connection
+        rows: Tuples of save_observation's positional arguments after conn,
+            i.e. (session_id, obs_type, content[, file_refs, compressed, project_path])
+
+    Returns:
+        Ids of the inserted observations, in input order
+    """
+    if not rows:
+        return []
+
+    # IMMEDIATE takes the write lock up front, so the AUTOINCREMENT ids
+    # handed out below are contiguous and can be recovered from the last one
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(_INSERT_OBSERVATION, [_observation_row(*row) for row in rows])
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
 def search_fts(
     conn: sqlite3.Connection,
     query: str,
     limit: int = 20,
     project_path: str | None = None,
-) -> list[dict[str, Any]]:
-    """Full-text search on observations with optional project filter."""
+) -> Iterator[dict[str, Any]]:
+    """Full-text search on observations with optional project filter.
+
+    Rows are yielded as they are read; wrap in list() if you need them all.
+    """
     if project_path:
+        # The filter lives on observations, so it has to be applied in the join
         cursor = conn.execute(
             """
-            SELECT o.*, rank
+            SELECT o.*, bm25(observations_fts) AS rank
             FROM observations_fts
             JOIN observations o ON observations_fts.rowid = o.id
             WHERE observations_fts MATCH ? AND o.project_path = ?
@@ -131,15 +237,23 @@ def search_fts(
             (query, project_path, limit),
         )
     else:
+        # Rank and limit inside the FTS table first (FTS5's ORDER BY rank LIMIT
+        # fast path), then join only the top hits instead of every match
         cursor = conn.execute(
             """
-            SELECT o.*, rank
-            FROM observations_fts
-            JOIN observations o ON observations_fts.rowid = o.id
-            WHERE observations_fts MATCH ?
-            ORDER BY rank
-            LIMIT ?
+            WITH hits AS (
+                SELECT rowid, rank
+                FROM observations_fts
+                WHERE observations_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            )
+            SELECT o.*, hits.rank
+            FROM hits
+            JOIN observations o ON o.id = hits.rowid
+            ORDER BY hits.rank
             """,
             (query, limit),
         )
-    return [dict(row) for row in cursor.fetchall()]
+    for row in cursor:
+        yield dict(row)
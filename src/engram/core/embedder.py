@@ -1,6 +1,16 @@
 """Embedding generation using Ollama."""
 
+import json
+
 import httpx
+import numpy as np
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # optional speedup, see the "fast" extra
+    _loads = json.loads
 
 OLLAMA_BASE_URL = "http://localhost:11434"
 DEFAULT_MODEL = "bge-m3"
@@ -12,20 +22,50 @@ class OllamaEmbedder:
     def __init__(self, model: str = DEFAULT_MODEL, base_url: str = OLLAMA_BASE_URL):
         self.model = model
         self.base_url = base_url
-        self._client = httpx.Client(timeout=60.0)
+        # Keep connections warm so repeated batches skip the TCP handshake
+        self._client = httpx.Client(
+            timeout=60.0,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+
+    def embed(self, text: str) -> np.ndarray:
+        """Generate a unit-length float32 embedding for a single text."""
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts in a single request.
+
+        Rows are L2-normalized, so a dot product between two embeddings is
+        their cosine similarity.
+
+        Returns:
+            float32 array of shape (N, D)
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
 
-    def embed(self, text: str) -> list[float]:
-        """Generate embedding for a single text."""
+        response = self._client.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model, "input": texts},
+        )
+        if response.status_code == 404:
+            # Ollama < 0.3.4 only has the single-text endpoint
+            vectors = np.stack([self._embed_legacy(text) for text in texts])
+        else:
+            response.raise_for_status()
+            vectors = np.asarray(_loads(response.content)["embeddings"], dtype=np.float32)
+
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+        return vectors
+
+    def _embed_legacy(self, text: str) -> np.ndarray:
         response = self._client.post(
             f"{self.base_url}/api/embeddings",
             json={"model": self.model, "prompt": text},
         )
         response.raise_for_status()
-        return response.json()["embedding"]
-
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for multiple texts."""
-        return [self.embed(text) for text in texts]
+        return np.asarray(_loads(response.content)["embedding"], dtype=np.float32)
 
     def is_available(self) -> bool:
         """Check if Ollama is running and model is available."""
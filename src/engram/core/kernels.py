@@ -0,0 +1,113 @@
+"""Similarity kernels, using SimSIMD or Numba when they are installed."""
+
+import functools
+import os
+
+import numpy as np
+
+try:
+    import simsimd
+except ImportError:  # optional speedup, see the "fast" extra
+    simsimd = None
+
+# Without SimSIMD, int8 rows are widened to float32 this many at a time so
+# BLAS does the arithmetic while the working set stays small
+SCAN_BLOCK = 4096
+
+# Set to use a Numba kernel for int8 scans when SimSIMD is missing. Importing
+# Numba costs ~0.2s, so this only pays off in long-lived processes that scan
+# repeatedly (e.g. batch_search in a script), not in one-shot CLI calls.
+JIT_ENV = "ENGRAM_JIT"
+
+
+def dot_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Dot product of one query vector with every row of a matrix.
+
+    Embeddings are unit-length, so this is their cosine similarity without
+    the norm, square root and division a cosine kernel would spend per row.
+    float32 and int8 matrices are supported; the query is cast to match.
+
+    Returns:
+        float32 array with one score per row
+    """
+    return dot_scores_batch(np.asarray(query)[None, :], matrix)[0]
+
+
+def dot_scores_batch(queries: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Dot products of several query vectors with every row of a matrix.
+
+    One matrix-matrix product instead of a pass over the matrix per query.
+
+    Returns:
+        float32 array of shape (len(queries), len(matrix))
+    """
+    queries = np.ascontiguousarray(queries, dtype=matrix.dtype)
+    if simsimd is not None and len(matrix):
+        # int8 inputs use the VNNI / dot-product instructions where the CPU has them
+        scores = simsimd.cdist(queries, matrix, metric="dot")
+        return np.asarray(scores, dtype=np.float32)
+
+    if matrix.dtype != np.int8:
+        return queries @ matrix.T
+
+    kernel = _int8_kernel(matrix.shape[1])
+    if kernel is not None:
+        scores = np.empty((len(queries), len(matrix)), dtype=np.float32)
+        kernel(queries, matrix, scores)
+        return scores
+
+    queries_t = queries.astype(np.float32).T
+    scores = np.empty((len(queries), len(matrix)), dtype=np.float32)
+    for start in range(0, len(matrix), SCAN_BLOCK):
+        block = matrix[start:start + SCAN_BLOCK].astype(np.float32)
+        scores[:, start:start + SCAN_BLOCK] = (block @ queries_t).T
+    return scores
+
+
+@functools.cache
+def _int8_kernel(dim: int):
+    """
+    Compile an int8 dot kernel for one row width, or None if not enabled.
+
+    The width is a compile-time constant, so the inner loop is fully
+    unrolled and vectorized with no tail handling, and rows are read in
+    place instead of being widened to float32 first. Compiled code is
+    cached on disk, keyed by width.
+    """
+    if not os.environ.get(JIT_ENV):
+        return None
+    try:
+        import numba
+    except ImportError:  # optional speedup, see the "jit" extra
+        return None
+
+    @numba.njit(fastmath=True, boundscheck=False, nogil=True, cache=True)
+    def kernel(queries, matrix, out):
+        for r in range(matrix.shape[0]):
+            row = matrix[r]
+            for q in range(queries.shape[0]):
+                query = queries[q]
+                acc = np.int32(0)
+                for i in range(dim):
+                    acc += np.int32(query[i]) * np.int32(row[i])
+                out[q, r] = acc
+
+    return kernel
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Partitions in O(N) and sorts only the k winners, instead of sorting
+    every score.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        idx = np.argpartition(scores, -k)[-k:]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
@@ -1,9 +1,20 @@
 """Project detection utilities."""
 
-import subprocess
+import functools
+import os
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=1)
+def _find_project_root(cwd: str) -> str:
+    path = Path(cwd).resolve()
+    for parent in (path, *path.parents):
+        # .git is a directory in normal clones and a file in worktrees/submodules
+        if (parent / ".git").exists():
+            return str(parent)
+    return str(path)
+
+
 def get_project_path() -> str:
     """
     Detect current project path.
@@ -15,24 +26,12 @@ def get_project_path() -> str:
     Returns:
         Absolute path to project root
     """
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-
-    return str(Path.cwd().resolve())
-
-
-def get_project_name() -> str:
+    return _find_project_root(os.getcwd())
+
+
+def get_project_name(project_path: str | None = None) -> str:
     """Get project name from path."""
-    return Path(get_project_path()).name
+    return Path(project_path or get_project_path()).name
 
 
 def is_same_project(path1: str, path2: str) -> bool:
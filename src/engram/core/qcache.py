@@ -0,0 +1,135 @@
+"""In-process cache for vector search results."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from .kernels import dot_scores
+
+DEFAULT_MAX_SIZE = 512
+DEFAULT_TTL = 300.0  # seconds
+DEFAULT_THRESHOLD = 0.95  # cosine similarity for a near-hit
+
+
+class QueryCache:
+    """
+    LRU + TTL cache of search results.
+
+    Lookups first try an exact match on the query text, then a near match on
+    the query embedding (cosine >= threshold) so rephrased queries can reuse
+    results without another index query. Entries only match within the same
+    scope (limit, filters). Entries stored without an embedding only serve
+    exact matches.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: float = DEFAULT_TTL,
+        threshold: float = DEFAULT_THRESHOLD,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        # key -> (scope, normalized embedding or None, results, expires_at)
+        self._entries: OrderedDict[str, tuple[str, np.ndarray | None, list, float]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._matrix: np.ndarray | None = None
+        self._matrix_keys: list[str] = []
+
+    @staticmethod
+    def scope(*params: Any) -> str:
+        """Build a scope string from the parameters that shape a result set."""
+        return json.dumps(params, sort_keys=True, default=str)
+
+    @staticmethod
+    def _key(query: str, scope: str) -> str:
+        return hashlib.sha1(f"{scope}\0{query}".encode()).hexdigest()
+
+    def get(self, query: str, scope: str = "") -> list[dict[str, Any]] | None:
+        """Return cached results for an identical query, if any."""
+        key = self._key(query, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[3] < time.monotonic():
+                self._evict(key)
+                return None
+            self._entries.move_to_end(key)
+            return _copy(entry[2])
+
+    def get_similar(
+        self, embedding: np.ndarray, scope: str = ""
+    ) -> list[dict[str, Any]] | None:
+        """Return cached results for the most similar cached query above threshold."""
+        q = _normalize(embedding)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix_keys = [k for k, e in self._entries.items() if e[1] is not None]
+                if not self._matrix_keys:
+                    return None
+                self._matrix = np.stack([self._entries[k][1] for k in self._matrix_keys])
+
+            sims = dot_scores(q, self._matrix)
+            now = time.monotonic()
+            for i in np.argsort(-sims):
+                if sims[i] < self.threshold:
+                    break
+                key = self._matrix_keys[i]
+                entry = self._entries.get(key)
+                if entry is None or entry[0] != scope or entry[3] < now:
+                    continue
+                self._entries.move_to_end(key)
+                return _copy(entry[2])
+        return None
+
+    def put(
+        self,
+        query: str,
+        embedding: np.ndarray | None,
+        results: list[dict[str, Any]],
+        scope: str = "",
+    ) -> None:
+        """Cache results for a query."""
+        key = self._key(query, scope)
+        with self._lock:
+            self._entries[key] = (
+                scope,
+                None if embedding is None else _normalize(embedding),
+                _copy(results),
+                time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._matrix = None
+
+    def clear(self) -> None:
+        """Drop all cached results (call after the underlying data changes)."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            self._matrix_keys = []
+
+    def _evict(self, key: str) -> None:
+        del self._entries[key]
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _normalize(embedding: np.ndarray) -> np.ndarray:
+    v = np.asarray(embedding, dtype=np.float32)
+    return v / (np.linalg.norm(v) + 1e-12)
+
+
+def _copy(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # Callers annotate rows in place (score, source), so hand out fresh dicts
+    return [dict(r) for r in results]
@@ -0,0 +1,259 @@
+"""INT8-quantized copy of the vector corpus for fast brute-force scans."""
+
+import contextlib
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are not serialized
+    fcntl = None
+
+from .kernels import dot_scores_batch, top_k
+
+DEFAULT_QUANT_DIR = Path.home() / ".engram" / "vecs" / "observations"
+
+
+def quantize(embeddings: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize row vectors to int8 with one scale per row.
+
+    Rows must already be L2-normalized (VectorStore does this at ingest), so
+    the dot product of two dequantized rows approximates their cosine
+    similarity.
+
+    Returns:
+        (int8 matrix, float32 scales) such that row ~= q * scale / 127
+    """
+    v = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    scales = np.abs(v).max(axis=1).astype(np.float32)
+    scales[scales == 0] = 1.0
+    q = np.round(v / scales[:, None] * 127).astype(np.int8)
+    return q, scales
+
+
+# vecs.i8.dat starts with the row width so the file can be mapped on its own
+HEADER = np.dtype("<i8")
+
+
+class QuantizedIndex:
+    """
+    Flat int8 index for one collection, stored next to ChromaDB.
+
+    Holds a 4x smaller copy of every embedding so a full scan is cheap enough
+    to pick rerank candidates. Rows live back to back in one raw file,
+    vecs.i8.dat, which is memory-mapped for scans and grown in place on add.
+    The small vecs.scale.npy (N float32) and vecs.ids.npy (N int64) files
+    are rewritten atomically and decide how many rows are valid.
+
+    Several processes (the capture daemon, a background flush, `engram save`)
+    may share the files, so writes hold an exclusive lock on vecs.lock and
+    start from what is on disk rather than from this instance's last view.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or DEFAULT_QUANT_DIR
+        self._vecs_path = self.path / "vecs.i8.dat"
+        self._scales_path = self.path / "vecs.scale.npy"
+        self._ids_path = self.path / "vecs.ids.npy"
+        self._lock_path = self.path / "vecs.lock"
+        self._stamp: tuple[int, int] | None = None
+        self._loaded = False
+        self.refresh()
+
+    @contextlib.contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        """Hold vecs.lock and reload the index from disk."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock_path.open("a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                self._load()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _ids_stamp(self) -> tuple[int, int] | None:
+        try:
+            st = self._ids_path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def refresh(self) -> None:
+        """Pick up rows written by other processes since the last load."""
+        if not self._loaded or self._ids_stamp() != self._stamp:
+            with self._locked(shared=True):
+                pass
+
+    def _reset(self) -> None:
+        self._vecs = None
+        self._dim = 0
+        self._scales = np.empty(0, dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+
+    def _load(self) -> None:
+        self._loaded = True
+        self._stamp = self._ids_stamp()
+        try:
+            scales = np.load(self._scales_path)
+            ids = np.load(self._ids_path)
+            with self._vecs_path.open("rb") as f:
+                dim = int(np.frombuffer(f.read(HEADER.itemsize), dtype=HEADER)[0])
+            size = self._vecs_path.stat().st_size
+        except (FileNotFoundError, ValueError, IndexError):
+            self._reset()
+            return
+
+        if len(scales) != len(ids) or size < HEADER.itemsize + len(ids) * dim:
+            # Torn write from a concurrent process; treat as empty so callers resync
+            self._reset()
+            return
+
+        self._dim, self._scales, self._ids = dim, scales, ids
+        self._map()
+
+    def _map(self) -> None:
+        # Only the first len(ids) rows are valid; a crashed append may leave more
+        if not len(self._ids):
+            self._vecs = None
+            return
+        self._vecs = np.memmap(
+            self._vecs_path,
+            dtype=np.int8,
+            mode="r",
+            offset=HEADER.itemsize,
+            shape=(len(self._ids), self._dim),
+        )
+
+    def _write_rows(self, rows: np.ndarray, start: int) -> None:
+        """Write int8 rows to vecs.i8.dat beginning at row index start."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        if start == 0:
+            # Full rewrites go through a new file so readers keep the old mapping
+            tmp = self._vecs_path.with_name(f"{self._vecs_path.name}.{os.getpid()}.tmp")
+            with tmp.open("wb") as f:
+                f.write(np.array([self._dim], dtype=HEADER).tobytes())
+                f.write(np.ascontiguousarray(rows).tobytes())
+            os.replace(tmp, self._vecs_path)
+            return
+
+        with self._vecs_path.open("r+b") as f:
+            f.seek(HEADER.itemsize + start * self._dim)
+            f.write(np.ascontiguousarray(rows).tobytes())
+            f.truncate()
+
+    def _save(self, scales: np.ndarray, ids: np.ndarray) -> None:
+        for target, array in ((self._scales_path, scales), (self._ids_path, ids)):
+            tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            with tmp.open("wb") as f:
+                np.save(f, array)
+            os.replace(tmp, target)
+        self._scales, self._ids = scales, ids
+        self._stamp = self._ids_stamp()
+        self._map()
+
+    def _rewrite(self, vecs: np.ndarray, scales: np.ndarray, ids: np.ndarray) -> None:
+        if not len(ids):
+            self._clear()
+            return
+        self._dim = vecs.shape[1]
+        self._write_rows(vecs, 0)
+        self._save(scales, ids)
+
+    def add(self, ids: list[int], embeddings: np.ndarray) -> None:
+        """Quantize and append embeddings, replacing any existing rows with the same ids."""
+        if not len(ids):
+            return
+        new_ids = np.asarray(ids, dtype=np.int64)
+        q, scales = quantize(embeddings)
+        with self._locked():
+            self._add(new_ids, q, scales)
+
+    def _add(self, new_ids: np.ndarray, q: np.ndarray, scales: np.ndarray) -> None:
+        if self._vecs is None:
+            self._rewrite(q, scales, new_ids)
+            return
+
+        if q.shape[1] != self._dim:
+            raise ValueError(f"Expected {self._dim}-dimensional vectors, got {q.shape[1]}")
+
+        replaced = np.isin(self._ids, new_ids)
+        if replaced.any():
+            keep = ~replaced
+            self._rewrite(
+                np.concatenate([self._vecs[keep], q]),
+                np.concatenate([self._scales[keep], scales]),
+                np.concatenate([self._ids[keep], new_ids]),
+            )
+            return
+
+        # Common case: grow the file in place instead of rewriting every row
+        self._write_rows(q, len(self._ids))
+        self._save(np.concatenate([self._scales, scales]), np.concatenate([self._ids, new_ids]))
+
+    def rebuild(self, ids: list[int], embeddings: np.ndarray) -> None:
+        """Replace every row with the given embeddings."""
+        with self._locked():
+            if not len(ids):
+                self._clear()
+                return
+            q, scales = quantize(embeddings)
+            self._dim = q.shape[1]
+            self._rewrite(q, scales, np.asarray(ids, dtype=np.int64))
+
+    def clear(self) -> None:
+        """Drop all rows."""
+        with self._locked():
+            self._clear()
+
+    def _clear(self) -> None:
+        self._reset()
+        for target in (self._vecs_path, self._scales_path, self._ids_path):
+            target.unlink(missing_ok=True)
+        self._stamp = None
+
+    def remove(self, ids: list[int]) -> None:
+        """Drop rows for the given ids."""
+        with self._locked():
+            if self._vecs is None:
+                return
+            keep = ~np.isin(self._ids, np.asarray(ids, dtype=np.int64))
+            if keep.all():
+                return
+            self._rewrite(self._vecs[keep], self._scales[keep], self._ids[keep])
+
+    def search(self, query: np.ndarray, limit: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate cosine search over the int8 rows.
+
+        Returns:
+            (ids, approximate similarities), best first
+        """
+        return self.search_batch(np.atleast_2d(query), limit)[0]
+
+    def search_batch(
+        self, queries: np.ndarray, limit: int
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Like search(), for several queries with one scan over the rows."""
+        if self._vecs is None or not len(self._ids):
+            empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+            return [empty for _ in range(len(queries))]
+
+        q, q_scales = quantize(queries)
+        scores = dot_scores_batch(q, self._vecs)
+        scores *= self._scales[None, :] * (q_scales[:, None] / (127 * 127))
+
+        results = []
+        for row in scores:
+            top = top_k(row, limit)
+            results.append((self._ids[top], row[top]))
+        return results
+
+    def __len__(self) -> int:
+        return len(self._ids)
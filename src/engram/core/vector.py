@@ -1,14 +1,37 @@
 """Vector storage using ChromaDB."""
 
+import os
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
 from .embedder import OllamaEmbedder
+from .kernels import dot_scores_batch, top_k
+from .quant import QuantizedIndex
 
 DEFAULT_CHROMA_PATH = Path.home() / ".engram" / "chroma"
+DEFAULT_CHROMA_PORT = 8000
+
+# Point at a running `engram serve` / `chroma run` instead of opening the files in-process
+CHROMA_URL_ENV = "ENGRAM_CHROMA_URL"
+
+# Chroma recommends batches of 50-250 items per add() call
+ADD_BATCH_SIZE = 250
+
+# Candidates taken from the int8 scan and reranked with full-precision vectors
+RERANK_CANDIDATES = 200
+
+# Above this many vectors a linear int8 scan loses to Chroma's HNSW graph walk
+FLAT_SCAN_LIMIT = 200_000
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so a plain dot product equals cosine similarity."""
+    return embeddings / (np.linalg.norm(embeddings, axis=-1, keepdims=True) + 1e-12)
 
 
 class VectorStore:
@@ -18,28 +41,61 @@ class VectorStore:
         self,
         path: Path | None = None,
         collection_name: str = "observations",
+        server_url: str | None = None,
     ):
         self.path = path or DEFAULT_CHROMA_PATH
-        self.path.mkdir(parents=True, exist_ok=True)
+        self.server_url = server_url or os.environ.get(CHROMA_URL_ENV)
 
-        self._client = chromadb.PersistentClient(
-            path=str(self.path),
-            settings=Settings(anonymized_telemetry=False),
-        )
+        if self.server_url:
+            # A long-lived server keeps the HNSW index loaded between CLI calls
+            url = urlsplit(self.server_url)
+            if url.path.strip("/"):
+                # HttpClient always talks to /api on the host root
+                raise ValueError(f"{CHROMA_URL_ENV} must not have a path: {self.server_url}")
+            ssl = url.scheme == "https"
+            self._client = chromadb.HttpClient(
+                host=url.hostname or "localhost",
+                port=url.port or (443 if ssl else DEFAULT_CHROMA_PORT),
+                ssl=ssl,
+                settings=Settings(anonymized_telemetry=False),
+            )
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._client = chromadb.PersistentClient(
+                path=str(self.path),
+                settings=Settings(anonymized_telemetry=False),
+            )
+        # Embeddings are unit-length, so inner product ranks like cosine without
+        # the per-comparison normalization. Chroma keeps the space of existing
+        # collections, which may still be "cosine"; distances match either way.
         self._collection = self._client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"},
+            metadata={"hnsw:space": "ip", "hnsw:search_ef": 128},
         )
+        # Only "ip" collections are guaranteed to hold unit-length vectors;
+        # older "cosine" ones may have rows stored before ingest normalized them
+        space = (self._collection.metadata or {}).get("hnsw:space", "l2")
+        self._normalized = space == "ip"
         self._embedder = OllamaEmbedder()
+        # Bumped on every write so callers can tell when cached results go stale
+        self.version = 0
+        # One int8 copy per local collection. In server mode the collection
+        # may be shared with other machines, so only Chroma's own index is used.
+        self._quant = None
+        if not self.server_url:
+            self._quant = QuantizedIndex(self.path.parent / "vecs" / collection_name)
 
     def add(
         self,
         observation_id: int,
         content: str,
         metadata: dict[str, Any] | None = None,
+        embedding: list[float] | np.ndarray | None = None,
     ) -> None:
-        """Add an observation to the vector store."""
-        embedding = self._embedder.embed(content)
+        """Add an observation to the vector store, embedding it unless a vector is given."""
+        if embedding is None:
+            embedding = self._embedder.embed(content)
+        embedding = _normalize(np.asarray(embedding, dtype=np.float32))
 
         self._collection.add(
             ids=[str(observation_id)],
@@ -47,39 +103,213 @@ class VectorStore:
             documents=[content],
             metadatas=[metadata or {}],
         )
+        if self._quant is not None:
+            self._quant.add([observation_id], [embedding])
+        self.version += 1
+
+    def add_many(
+        self,
+        observation_ids: list[int],
+        contents: list[str],
+        metadatas: list[dict[str, Any]] | None = None,
+        embeddings: list[list[float]] | np.ndarray | None = None,
+    ) -> None:
+        """
+        Add several observations with batched embedding and collection writes.
+
+        Pass embeddings when they were already computed (e.g. one embed_batch
+        call for a whole flush) to skip the embedding round-trips.
+        """
+        metadatas = metadatas or [{} for _ in contents]
+        if embeddings is not None:
+            embeddings = _normalize(np.asarray(embeddings, dtype=np.float32))
+
+        for start in range(0, len(observation_ids), ADD_BATCH_SIZE):
+            end = start + ADD_BATCH_SIZE
+            batch = contents[start:end]
+            if embeddings is None:
+                batch_embeddings = self._embedder.embed_batch(batch)
+            else:
+                batch_embeddings = embeddings[start:end]
+            self._collection.add(
+                ids=[str(obs_id) for obs_id in observation_ids[start:end]],
+                embeddings=batch_embeddings,
+                documents=batch,
+                metadatas=[m or {} for m in metadatas[start:end]],
+            )
+            if self._quant is not None:
+                self._quant.add(observation_ids[start:end], batch_embeddings)
+        self.version += 1
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed one text, e.g. a query to reuse across several lookups."""
+        return self._embedder.embed(text)
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed texts in one request, for callers that batch their own writes."""
+        return self._embedder.embed_batch(texts)
 
     def search(
         self,
         query: str,
         limit: int = 10,
         where: dict[str, Any] | None = None,
+        query_embedding: np.ndarray | None = None,
     ) -> list[dict[str, Any]]:
-        """Semantic search for similar observations."""
-        query_embedding = self._embedder.embed(query)
+        """
+        Semantic search for similar observations, embedding the query unless given.
+
+        Each result carries "score" (cosine similarity, higher is better) and
+        "distance" (1 - score).
+        """
+        if query_embedding is None:
+            query_embedding = self._embedder.embed(query)
+        return self.search_batch([query], limit, where, np.atleast_2d(query_embedding))[0]
 
+    def search_batch(
+        self,
+        queries: list[str],
+        limit: int = 10,
+        where: dict[str, Any] | None = None,
+        query_embeddings: np.ndarray | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search for several queries at once.
+
+        Embeds every query in one request and scores them all in one pass
+        over the corpus. Returns one result list per query, in order.
+        """
+        if not queries:
+            return []
+        if query_embeddings is None:
+            query_embeddings = self._embedder.embed_batch(queries)
+        else:
+            query_embeddings = _normalize(np.asarray(query_embeddings, dtype=np.float32))
+
+        if self._use_flat_scan(where):
+            return self._search_quantized(query_embeddings, limit)
+        return self._search_hnsw(query_embeddings, limit, where)
+
+    def _use_flat_scan(self, where: dict[str, Any] | None) -> bool:
+        # The int8 scan can't apply metadata filters, is only trustworthy while
+        # it mirrors the whole collection, and is linear, so large corpora go
+        # to the sublinear HNSW index instead
+        if where is not None or self._quant is None:
+            return False
+        count = self._collection.count()
+        if not 0 < count <= FLAT_SCAN_LIMIT:
+            return False
+        # Another process may have written to (or crashed while writing to)
+        # the collection since this store last looked at the int8 copy
+        self.sync_quantized(count)
+        return len(self._quant) == count
+
+    def _search_hnsw(
+        self,
+        query_embeddings: np.ndarray,
+        limit: int,
+        where: dict[str, Any] | None,
+    ) -> list[list[dict[str, Any]]]:
         results = self._collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=query_embeddings,
             n_results=limit,
             where=where,
             include=["documents", "metadatas", "distances"],
         )
 
-        # Flatten results
-        observations = []
-        if results["ids"] and results["ids"][0]:
-            for i, obs_id in enumerate(results["ids"][0]):
+        # Flatten results, one list per query
+        batches = []
+        for q, ids in enumerate(results["ids"] or [[] for _ in query_embeddings]):
+            observations = []
+            for i, obs_id in enumerate(ids):
+                distance = results["distances"][q][i] if results["distances"] else None
                 observations.append({
                     "id": int(obs_id),
-                    "content": results["documents"][0][i] if results["documents"] else None,
-                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                    "distance": results["distances"][0][i] if results["distances"] else None,
+                    "content": results["documents"][q][i] if results["documents"] else None,
+                    "metadata": results["metadatas"][q][i] if results["metadatas"] else {},
+                    "distance": distance,
+                    "score": 1.0 - distance if distance is not None else 0.0,
+                })
+            batches.append(observations)
+        return batches
+
+    def _search_quantized(
+        self, query_embeddings: np.ndarray, limit: int
+    ) -> list[list[dict[str, Any]]]:
+        """Pick candidates with the int8 scan, then rerank them with a float32 dot product."""
+        candidates = self._quant.search_batch(query_embeddings, max(RERANK_CANDIDATES, limit))
+        candidate_ids = np.unique(np.concatenate([ids for ids, _ in candidates]))
+        if not len(candidate_ids):
+            return [[] for _ in query_embeddings]
+
+        # One fetch for the union of all candidates, then one SGEMM to score
+        # every query against it
+        got = self._collection.get(
+            ids=[str(i) for i in candidate_ids],
+            include=["embeddings", "documents", "metadatas"],
+        )
+        embeddings = np.asarray(got["embeddings"], dtype=np.float32)
+        if not self._normalized:
+            embeddings = _normalize(embeddings)
+        all_sims = dot_scores_batch(query_embeddings, embeddings)
+
+        batches = []
+        for sims in all_sims:
+            observations = []
+            for i in top_k(sims, limit):
+                sim = float(sims[i])
+                observations.append({
+                    "id": int(got["ids"][i]),
+                    "content": got["documents"][i] if got["documents"] else None,
+                    "metadata": (got["metadatas"][i] if got["metadatas"] else None) or {},
+                    "distance": 1.0 - sim,
+                    "score": sim,
                 })
+            batches.append(observations)
+        return batches
+
+    def sync_quantized(self, count: int | None = None) -> bool:
+        """
+        Rebuild the int8 index from the collection if they have drifted apart.
+
+        Args:
+            count: Collection size, if the caller already has it
+
+        Returns:
+            True if a rebuild was needed
+        """
+        if self._quant is None:
+            return False
+        if count is None:
+            count = self._collection.count()
+        self._quant.refresh()
+        if len(self._quant) == count:
+            return False
+
+        ids: list[int] = []
+        embeddings = []
+        offset = 0
+        while True:
+            page = self._collection.get(include=["embeddings"], limit=1000, offset=offset)
+            if not page["ids"]:
+                break
+            ids.extend(int(i) for i in page["ids"])
+            page_embeddings = np.asarray(page["embeddings"], dtype=np.float32)
+            if not self._normalized:
+                page_embeddings = _normalize(page_embeddings)
+            embeddings.append(page_embeddings)
+            offset += len(page["ids"])
 
-        return observations
+        self._quant.rebuild(ids, np.concatenate(embeddings) if embeddings else None)
+        self.version += 1
+        return True
 
     def delete(self, observation_id: int) -> None:
         """Delete an observation from the vector store."""
         self._collection.delete(ids=[str(observation_id)])
+        if self._quant is not None:
+            self._quant.remove([observation_id])
+        self.version += 1
 
     def count(self) -> int:
         """Get total number of observations."""
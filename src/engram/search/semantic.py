@@ -1,17 +1,64 @@
 """Semantic search combining FTS and vector search."""
 
-from typing import Any
+import heapq
+import operator
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
-from ..core.db import init_db, search_fts
-from ..core.vector import VectorStore
+import numpy as np
+
+from ..core import get_db, get_vector_store
+from ..core.db import search_fts
+from ..core.embedder import OllamaEmbedder
+from ..core.qcache import DEFAULT_THRESHOLD, QueryCache
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from ..core.vector import VectorStore
+
+# Rank offset for Reciprocal Rank Fusion (the value from the original RRF paper)
+RRF_K = 60
+
+# Keyword results are cheap to recompute, so keep fewer of them
+FTS_CACHE_SIZE = 128
+
+_score = operator.itemgetter("score")
+_second = operator.itemgetter(1)
+
+# Embeds hybrid queries while FTS runs
+_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="engram-search")
 
 
 class SemanticSearch:
     """Hybrid search combining full-text and vector search."""
 
-    def __init__(self):
-        self._db = init_db()
-        self._vector = VectorStore()
+    def __init__(self, similarity_threshold: float = DEFAULT_THRESHOLD):
+        """
+        Args:
+            similarity_threshold: Cosine similarity at which a new query reuses
+                the results of an earlier one
+        """
+        # Opened on first use, so keyword-only searches never load the vector index
+        self._db: sqlite3.Connection | None = None
+        self._vector: VectorStore | None = None
+        self._cache = QueryCache(threshold=similarity_threshold)
+        self._fts_cache = QueryCache(max_size=FTS_CACHE_SIZE)
+
+    @property
+    def db(self) -> "sqlite3.Connection":
+        """Shared database connection, opened on first access."""
+        if self._db is None:
+            self._db = get_db()
+        return self._db
+
+    @property
+    def vector(self) -> "VectorStore":
+        """Shared vector store, opened on first access."""
+        if self._vector is None:
+            self._vector = get_vector_store()
+        return self._vector
 
     def search(
         self,
@@ -19,6 +66,8 @@ class SemanticSearch:
         limit: int = 10,
         mode: str = "hybrid",
         project_path: str | None = None,
+        fusion: str = "rrf",
+        alpha: float = 0.5,
     ) -> list[dict[str, Any]]:
         """
         Search observations using specified mode.
@@ -28,39 +77,168 @@ class SemanticSearch:
             limit: Maximum results
             mode: "semantic" (vector only), "keyword" (FTS only), "hybrid" (both)
             project_path: Filter by project path (None = all projects)
+            fusion: How hybrid mode merges the two lists - "rrf" (reciprocal
+                rank) or "convex" (weighted sum of min-max normalized scores)
+            alpha: Weight of the semantic score in convex fusion
         """
+        # Cached result sets are only valid for the same options and data
+        vector_version = self.vector.version if mode != "keyword" else None
+        scope = QueryCache.scope(
+            mode, limit, project_path, fusion, alpha, vector_version, self._db_version()
+        )
+        cached = self._cache.get(query, scope)
+        if cached is not None:
+            return cached
+
         results = []
+        vector_results: list[dict[str, Any]] = []
+        fts_results: list[dict[str, Any]] = []
 
         # Build project filter for vector search
         where_filter = {"project_path": project_path} if project_path else None
 
-        if mode in ("semantic", "hybrid"):
-            vector_results = self._vector.search(query, limit=limit, where=where_filter)
-            for r in vector_results:
-                r["source"] = "semantic"
-                r["score"] = 1 - r.get("distance", 0)  # Convert distance to similarity
-            results.extend(vector_results)
+        embed_future = None
+        if mode == "hybrid":
+            # The embedding is an Ollama round-trip, so overlap it with FTS.
+            # FTS stays on this thread since the sqlite3 connection can't be
+            # used from another one.
+            embed_future = _POOL.submit(self.vector.embed, query)
 
         if mode in ("keyword", "hybrid"):
-            fts_results = search_fts(self._db, query, limit=limit, project_path=project_path)
-            for r in fts_results:
+            fts_results = self._search_fts(query, limit, project_path)
+            ranks = np.fromiter(
+                (r.get("rank") or 0 for r in fts_results),
+                dtype=np.float64,
+                count=len(fts_results),
+            )
+            for r, score in zip(fts_results, np.abs(ranks).tolist()):  # FTS5 rank is negative
                 r["source"] = "keyword"
-                r["score"] = abs(r.get("rank", 0))  # FTS5 rank is negative
+                r["score"] = score
             results.extend(fts_results)
 
+        # Embed once; a paraphrase of a recent query reuses its results
+        query_embedding = None
+        if mode in ("semantic", "hybrid"):
+            if embed_future is not None:
+                query_embedding = embed_future.result()
+            else:
+                query_embedding = self.vector.embed(query)
+            cached = self._cache.get_similar(query_embedding, scope)
+            if cached is not None:
+                return cached
+            vector_results = self.vector.search(
+                query, limit=limit, where=where_filter, query_embedding=query_embedding
+            )
+
+        if vector_results:
+            # Vector results are already scored by similarity
+            for r in vector_results:
+                r["source"] = "semantic"
+            results.extend(vector_results)
+
         if mode == "hybrid":
-            # Deduplicate by id, keeping highest score
-            seen = {}
+            if fusion == "convex":
+                results = _fuse_convex(vector_results, fts_results, alpha)
+            else:
+                results = _fuse_rrf(vector_results, fts_results, limit=limit)
+
+        # Top results by score, without sorting the whole list
+        results = heapq.nlargest(limit, results, key=_score)
+
+        self._cache.put(query, query_embedding, results, scope)
+        return results
+
+    def batch_search(
+        self,
+        queries: list[str],
+        limit: int = 10,
+        project_path: str | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Semantic search for several queries at once.
+
+        All queries are embedded in one request and scored in one pass over
+        the corpus, instead of one round-trip and one scan per query.
+
+        Returns:
+            One result list per query, in the same order
+        """
+        where_filter = {"project_path": project_path} if project_path else None
+        batches = self.vector.search_batch(queries, limit=limit, where=where_filter)
+        for results in batches:
             for r in results:
-                obs_id = r.get("id")
-                if obs_id not in seen or r.get("score", 0) > seen[obs_id].get("score", 0):
-                    seen[obs_id] = r
-            results = list(seen.values())
+                r["source"] = "semantic"
+        return batches
+
+    def _search_fts(
+        self, query: str, limit: int, project_path: str | None
+    ) -> list[dict[str, Any]]:
+        # Don't fold case: FTS5 only treats uppercase AND/OR/NOT/NEAR as operators
+        key = query.strip()
+        scope = QueryCache.scope(limit, project_path, self._db_version())
+        results = self._fts_cache.get(key, scope)
+        if results is None:
+            results = list(search_fts(self.db, query, limit=limit, project_path=project_path))
+            self._fts_cache.put(key, None, results, scope)
+        return results
+
+    def _db_version(self) -> tuple[int, int]:
+        # Changes with any committed write, from this connection or another process
+        return (
+            self.db.total_changes,
+            self.db.execute("PRAGMA data_version").fetchone()[0],
+        )
 
-        # Sort by score descending
-        results.sort(key=lambda x: x.get("score", 0), reverse=True)
-        return results[:limit]
+    def clear_cache(self) -> None:
+        """Forget cached search results."""
+        self._cache.clear()
+        self._fts_cache.clear()
 
     def is_ready(self) -> bool:
-        """Check if search system is ready."""
-        return self._vector.is_ready()
+        """Check if search system is ready, without opening the vector store."""
+        if self._vector is not None or get_vector_store.cache_info().currsize:
+            return self.vector.is_ready()
+        return OllamaEmbedder().is_available()
+
+
+def _fuse_rrf(*ranked_lists: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    """Merge rank-ordered lists with Reciprocal Rank Fusion, keeping the top `limit`."""
+    rrf: defaultdict[Any, float] = defaultdict(float)
+    rows: dict[Any, dict[str, Any]] = {}
+    for ranked in ranked_lists:
+        for rank, r in enumerate(ranked, RRF_K + 1):
+            obs_id = r["id"]
+            rrf[obs_id] += 1.0 / rank
+            rows.setdefault(obs_id, r)
+
+    fused = []
+    for obs_id, score in heapq.nlargest(limit, rrf.items(), key=_second):
+        r = rows[obs_id]
+        r["score"] = score
+        fused.append(r)
+    return fused
+
+
+def _fuse_convex(
+    vector_results: list[dict[str, Any]],
+    fts_results: list[dict[str, Any]],
+    alpha: float,
+) -> list[dict[str, Any]]:
+    """Merge lists with alpha * semantic + (1 - alpha) * keyword, each min-max normalized."""
+    fused: dict[Any, dict[str, Any]] = {}
+    scores: dict[Any, float] = {}
+    for ranked, weight in ((vector_results, alpha), (fts_results, 1.0 - alpha)):
+        if not ranked:
+            continue
+        raw = [r.get("score", 0) for r in ranked]
+        lo, hi = min(raw), max(raw)
+        span = hi - lo
+        for r, value in zip(ranked, raw):
+            obs_id = r.get("id")
+            fused.setdefault(obs_id, r)
+            normalized = (value - lo) / span if span else 1.0
+            scores[obs_id] = scores.get(obs_id, 0.0) + weight * normalized
+
+    for obs_id, r in fused.items():
+        r["score"] = scores[obs_id]
+    return list(fused.values())
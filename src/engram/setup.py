@@ -1,11 +1,37 @@
 """Setup and initialization utilities."""
 
+import functools
 import json
+import os
+import plistlib
+import re
+import shlex
 import shutil
-import subprocess
+import sys
+import urllib.request
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: dict) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:  # optional speedup, see the "fast" extra
+    _loads = json.loads
+
+    def _dumps(obj: dict) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+
 CLAUDE_SETTINGS_PATH = Path.home() / ".claude" / "settings.json"
+OLLAMA_TAGS_URL = "http://localhost:11434/api/tags"
+SYSTEMD_UNIT_PATH = Path.home() / ".config" / "systemd" / "user" / "engram.service"
+LAUNCHD_PLIST_PATH = Path.home() / "Library" / "LaunchAgents" / "com.engram.daemon.plist"
+
+# Matches hook commands that invoke engram
+ENGRAM_CMD_RE = re.compile(r"\bengram\b")
 
 # Engram hooks to add
 ENGRAM_HOOKS = {
@@ -30,35 +56,34 @@ ENGRAM_HOOKS = {
 }
 
 
+@functools.lru_cache(maxsize=1)
+def _ollama_models() -> list[str] | None:
+    """Names of locally available Ollama models, or None if Ollama isn't reachable."""
+    try:
+        with urllib.request.urlopen(OLLAMA_TAGS_URL, timeout=5) as response:
+            data = json.load(response)
+    except (OSError, ValueError):  # URLError, timeouts, bad JSON
+        return None
+    return [m.get("name", "") for m in data.get("models", [])]
+
+
 def check_ollama() -> tuple[bool, str]:
     """Check if Ollama is running."""
-    try:
-        result = subprocess.run(
-            ["curl", "-s", "http://localhost:11434/api/tags"],
-            capture_output=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return True, "Ollama is running"
-        return False, "Ollama not responding. Run: ollama serve"
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    if _ollama_models() is not None:
+        return True, "Ollama is running"
+    if shutil.which("ollama") is None:
         return False, "Ollama not found. Install from: https://ollama.ai"
+    return False, "Ollama not responding. Run: ollama serve"
 
 
 def check_model(model: str = "bge-m3") -> tuple[bool, str]:
     """Check if embedding model is available."""
-    try:
-        result = subprocess.run(
-            ["ollama", "list"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if model in result.stdout:
-            return True, f"Model {model} is available"
-        return False, f"Model not found. Run: ollama pull {model}"
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    models = _ollama_models()
+    if models is None:
         return False, "Cannot check model. Ollama not available."
+    if any(name.startswith(model) for name in models):
+        return True, f"Model {model} is available"
+    return False, f"Model not found. Run: ollama pull {model}"
 
 
 def check_global_install() -> tuple[bool, str]:
@@ -69,30 +94,99 @@ def check_global_install() -> tuple[bool, str]:
     return False, "Not globally installed. Run: uv tool install -e ."
 
 
+def install_daemon_service() -> tuple[bool, str]:
+    """
+    Write a user service definition that keeps `engram daemon` running.
+
+    An existing definition with different content is left untouched.
+    """
+    command = [sys.executable, "-m", "engram", "daemon"]
+
+    if sys.platform == "darwin":
+        path = LAUNCHD_PLIST_PATH
+        content = plistlib.dumps({
+            "Label": "com.engram.daemon",
+            "ProgramArguments": command,
+            "RunAtLoad": True,
+            "KeepAlive": True,
+        })
+        hint = f"Run: launchctl load {path}"
+    elif sys.platform.startswith("linux"):
+        path = SYSTEMD_UNIT_PATH
+        content = (
+            "[Unit]\n"
+            "Description=Engram capture daemon\n"
+            "\n"
+            "[Service]\n"
+            f"ExecStart={shlex.join(command)}\n"
+            "Restart=on-failure\n"
+            "\n"
+            "[Install]\n"
+            "WantedBy=default.target\n"
+        ).encode()
+        hint = "Run: systemctl --user enable --now engram"
+    else:
+        return False, f"No service manager support for {sys.platform}. Run: engram daemon"
+
+    try:
+        existing = path.read_bytes()
+    except FileNotFoundError:
+        existing = None
+
+    if existing == content:
+        return True, f"{path} already installed. {hint}"
+    if existing is not None:
+        return False, f"{path} already exists with other content; left unchanged"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return True, f"Wrote {path}. {hint}"
+
+
 def load_claude_settings() -> dict:
     """Load existing Claude settings or return empty dict."""
-    if CLAUDE_SETTINGS_PATH.exists():
-        try:
-            return json.loads(CLAUDE_SETTINGS_PATH.read_text())
-        except json.JSONDecodeError:
-            return {}
-    return {}
+    try:
+        return _loads(CLAUDE_SETTINGS_PATH.read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
 
 def save_claude_settings(settings: dict) -> None:
-    """Save Claude settings."""
-    CLAUDE_SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    CLAUDE_SETTINGS_PATH.write_text(json.dumps(settings, indent=2, ensure_ascii=False))
+    """
+    Save Claude settings.
+
+    Writes a temp file and renames it over the original, so hooks reading
+    the file concurrently never see it half-written. Skips the write when
+    the content is unchanged. A symlinked settings file (e.g. from a
+    dotfiles repo) is updated at its target, keeping the target's mode.
+    """
+    data = _dumps(settings)
+    target = CLAUDE_SETTINGS_PATH.resolve()
+    try:
+        if target.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        if target.exists():
+            shutil.copymode(target, tmp)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _is_engram_group(hook_group: dict) -> bool:
+    hooks = hook_group.get("hooks", [])
+    return any(ENGRAM_CMD_RE.search(hook.get("command", "")) for hook in hooks)
 
 
 def is_hook_installed(settings: dict, hook_type: str) -> bool:
     """Check if engram hook is already installed for given type."""
-    hooks = settings.get("hooks", {}).get(hook_type, [])
-    for hook_group in hooks:
-        for hook in hook_group.get("hooks", []):
-            if "engram" in hook.get("command", ""):
-                return True
-    return False
+    return any(map(_is_engram_group, settings.get("hooks", {}).get(hook_type, [])))
 
 
 def install_hooks(dry_run: bool = False) -> tuple[bool, str, dict]:
@@ -139,17 +233,20 @@ def uninstall_hooks() -> tuple[bool, str]:
         return True, "No hooks to remove"
 
     removed = []
-    for hook_type in list(settings["hooks"].keys()):
-        original_len = len(settings["hooks"][hook_type])
-        settings["hooks"][hook_type] = [
-            h for h in settings["hooks"][hook_type]
-            if not any("engram" in hook.get("command", "") for hook in h.get("hooks", []))
-        ]
-        if len(settings["hooks"][hook_type]) < original_len:
-            removed.append(hook_type)
+    for hook_type, groups in list(settings["hooks"].items()):
+        # Detect and drop engram groups in the same pass
+        kept = []
+        for group in groups:
+            if _is_engram_group(group):
+                if not removed or removed[-1] != hook_type:
+                    removed.append(hook_type)
+            else:
+                kept.append(group)
 
         # Clean up empty lists
-        if not settings["hooks"][hook_type]:
+        if kept:
+            settings["hooks"][hook_type] = kept
+        else:
             del settings["hooks"][hook_type]
 
     if removed:
@@ -0,0 +1,98 @@
+"""Tests for opening and migrating the SQLite database."""
+
+import sqlite3
+
+from engram.core.db import SCHEMA_VERSION, init_db, save_observation, search_fts
+
+# Schema written by engram 0.1.0, before user_version was tracked
+BASELINE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY,
+        started_at TEXT NOT NULL,
+        ended_at TEXT,
+        project_path TEXT,
+        summary TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS observations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        type TEXT NOT NULL,
+        content TEXT NOT NULL,
+        compressed TEXT,
+        file_refs TEXT,
+        project_path TEXT,
+        created_at TEXT NOT NULL,
+        token_count INTEGER,
+        FOREIGN KEY (session_id) REFERENCES sessions(id)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_observations_project ON observations(project_path);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS observations_fts USING fts5(
+        content,
+        compressed,
+        content='observations',
+        content_rowid='id'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS observations_ai AFTER INSERT ON observations BEGIN
+        INSERT INTO observations_fts(rowid, content, compressed)
+        VALUES (new.id, new.content, new.compressed);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS observations_ad AFTER DELETE ON observations BEGIN
+        INSERT INTO observations_fts(observations_fts, rowid, content, compressed)
+        VALUES ('delete', old.id, old.content, old.compressed);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS observations_au AFTER UPDATE ON observations BEGIN
+        INSERT INTO observations_fts(observations_fts, rowid, content, compressed)
+        VALUES ('delete', old.id, old.content, old.compressed);
+        INSERT INTO observations_fts(rowid, content, compressed)
+        VALUES (new.id, new.content, new.compressed);
+    END;
+"""
+
+
+def _baseline_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute(
+        "INSERT INTO observations (session_id, type, content, project_path, created_at)"
+        " VALUES ('s1', 'bugfix', 'fixed the flaky pytest fixture', '/repo', '2024-01-01')"
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_new_database_gets_current_version(tmp_path):
+    conn = init_db(tmp_path / "engram.db")
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+
+def test_baseline_database_is_migrated(tmp_path):
+    path = tmp_path / "engram.db"
+    _baseline_db(path)
+
+    conn = init_db(path)
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    fts_sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'observations_fts'"
+    ).fetchone()[0]
+    assert "prefix" in fts_sql
+
+
+def test_migrated_database_keeps_existing_rows_searchable(tmp_path):
+    path = tmp_path / "engram.db"
+    _baseline_db(path)
+    conn = init_db(path)
+
+    hits = list(search_fts(conn, "pytest"))
+    assert [h["content"] for h in hits] == ["fixed the flaky pytest fixture"]
+    assert [h["id"] for h in search_fts(conn, "pytest", project_path="/repo")] == [1]
+
+    # Prefix queries use the rebuilt index, and new rows are indexed too
+    save_observation(conn, "s2", "feature", "added pytest markers")
+    assert len(list(search_fts(conn, "pyt*"))) == 2
@@ -0,0 +1,85 @@
+"""Tests for the int8 index shared between processes."""
+
+import numpy as np
+
+from engram.core.quant import QuantizedIndex
+
+DIM = 16
+
+
+def _unit(seed: int, n: int = 1) -> np.ndarray:
+    v = np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def _ids(index: QuantizedIndex) -> list[int]:
+    ids, _ = index.search(_unit(0)[0], limit=100)
+    return sorted(ids.tolist())
+
+
+def test_search_finds_nearest_row(tmp_path):
+    index = QuantizedIndex(tmp_path)
+    vecs = _unit(1, 3)
+    index.add([1, 2, 3], vecs)
+
+    ids, scores = index.search(vecs[1], limit=1)
+    assert ids.tolist() == [2]
+    assert scores[0] > 0.95
+
+
+def test_add_from_stale_instance_keeps_other_writes(tmp_path):
+    a = QuantizedIndex(tmp_path)
+    b = QuantizedIndex(tmp_path)  # Opened before any of a's writes
+
+    a.add([1], _unit(1))
+    b.add([2], _unit(2))
+    a.add([3], _unit(3))
+
+    b.refresh()
+    assert _ids(b) == [1, 2, 3]
+    assert len(a) == 3
+
+
+def test_replace_is_seen_by_other_instance(tmp_path):
+    a = QuantizedIndex(tmp_path)
+    a.add([1, 2], _unit(1, 2))
+    b = QuantizedIndex(tmp_path)
+
+    replacement = _unit(9)
+    b.add([1], replacement)
+
+    a.refresh()
+    assert len(a) == 2
+    ids, _ = a.search(replacement[0], limit=1)
+    assert ids.tolist() == [1]
+
+
+def test_remove_is_seen_by_other_instance(tmp_path):
+    a = QuantizedIndex(tmp_path)
+    b = QuantizedIndex(tmp_path)
+    a.add([1, 2, 3], _unit(1, 3))
+
+    b.remove([2])
+
+    a.refresh()
+    assert _ids(a) == [1, 3]
+
+
+def test_rebuild_replaces_contents(tmp_path):
+    a = QuantizedIndex(tmp_path)
+    a.add([1, 2], _unit(1, 2))
+
+    QuantizedIndex(tmp_path).rebuild([7, 8, 9], _unit(2, 3))
+
+    a.refresh()
+    assert _ids(a) == [7, 8, 9]
+
+
+def test_torn_ids_file_loads_as_empty(tmp_path):
+    a = QuantizedIndex(tmp_path)
+    a.add([1, 2], _unit(1, 2))
+
+    # Scales and ids from different writes
+    np.save(tmp_path / "vecs.ids.npy", np.array([1, 2, 3], dtype=np.int64))
+
+    assert len(QuantizedIndex(tmp_path)) == 0
@@ -0,0 +1,123 @@
+"""Tests for flushing the hook capture spool."""
+
+import json
+
+import numpy as np
+import pytest
+
+import engram.core
+from engram.capture import spool
+from engram.core.db import init_db
+
+
+class FakeVectorStore:
+    """Records vector writes; raises for contents listed in `bad`."""
+
+    def __init__(self):
+        self.bad: set[str] = set()
+        self.added: dict[int, str] = {}
+
+    def is_ready(self) -> bool:
+        return True
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        if self.bad.intersection(texts):
+            raise RuntimeError("embedder rejected the batch")
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    def add_many(self, observation_ids, contents, metadatas, embeddings=None) -> None:
+        self.added.update(zip(observation_ids, contents))
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    conn = init_db(tmp_path / "engram.db")
+    monkeypatch.setattr(engram.core, "get_db", lambda: conn)
+    return conn
+
+
+@pytest.fixture
+def vector(monkeypatch):
+    store = FakeVectorStore()
+    monkeypatch.setattr(engram.core, "get_vector_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "pending.jsonl"
+
+
+def _rows(db) -> int:
+    return db.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+
+
+def _pending(path) -> list[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_flush_writes_rows_and_vectors(db, vector, path):
+    for content in ("one", "two"):
+        spool.append("s1", "discovery", content, path=path)
+
+    assert spool.flush(path) == 2
+    assert _rows(db) == 2
+    assert sorted(vector.added.values()) == ["one", "two"]
+    assert not path.exists()
+
+
+def test_vector_failure_keeps_rows_pending_with_ids(db, vector, path):
+    vector.bad = {"one", "two"}
+    for content in ("one", "two"):
+        spool.append("s1", "discovery", content, path=path)
+
+    assert spool.flush(path) == 0
+    assert _rows(db) == 2
+    pending = _pending(path)
+    assert [r["id"] for r in pending] == [1, 2]
+    assert [r["attempts"] for r in pending] == [1, 1]
+
+    # The retry only backfills vectors; SQLite gets no duplicates
+    vector.bad = set()
+    assert spool.flush(path) == 2
+    assert _rows(db) == 2
+    assert vector.added == {1: "one", 2: "two"}
+    assert not path.exists()
+
+
+def test_bad_record_does_not_hold_back_the_batch(db, vector, path):
+    vector.bad = {"bad"}
+    for content in ("good", "bad", "also good"):
+        spool.append("s1", "discovery", content, path=path)
+
+    assert spool.flush(path) == 2
+    assert sorted(vector.added.values()) == ["also good", "good"]
+    assert [r["content"] for r in _pending(path)] == ["bad"]
+
+
+def test_record_moves_to_failed_file_after_max_attempts(db, vector, path):
+    vector.bad = {"bad"}
+    spool.append("s1", "discovery", "bad", path=path)
+
+    for _ in range(spool.FLUSH_MAX_ATTEMPTS):
+        spool.flush(path)
+
+    assert not path.exists()
+    failed = _pending(path.with_name("pending.failed.jsonl"))
+    assert [r["content"] for r in failed] == ["bad"]
+    assert failed[0]["attempts"] == spool.FLUSH_MAX_ATTEMPTS
+
+
+def test_requeued_records_do_not_trigger_flush(db, vector, path, monkeypatch):
+    monkeypatch.setattr(spool, "FLUSH_MAX_AGE", 0.0)
+    vector.bad = {"bad"}
+    spool.append("s1", "discovery", "bad", path=path)
+    assert spool.should_flush(path)
+
+    spool.flush(path)
+    assert not spool.should_flush(path)
+
+    spool.append("s1", "discovery", "fresh", path=path)
+    assert spool.should_flush(path)